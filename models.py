@@ -28,6 +28,36 @@ class SummarizeResponse(BaseModel):
     summary: str
     main_topic: str
     session_id: Optional[str] = None
+    boilerplate_bytes_saved: int = 0
+    boilerplate_tokens_saved: int = 0
+    compression_tokens_saved: int = 0
+    diff_ratio: Optional[float] = None
+    incremental_tokens_saved: int = 0
+    cached_input_tokens: int = 0
+
+class CrawlRequest(BaseModel):
+    """Request model for crawling and summarizing a site section"""
+    url: HttpUrl
+    provider: Optional[str] = None
+    model: Optional[str] = None
+    max_pages: Optional[int] = Field(default=None, ge=1)
+
+class CrawlPageSummary(BaseModel):
+    """Summary of a single crawled page"""
+    url: str
+    summary: str
+    main_topic: str
+
+class CrawlResponse(BaseModel):
+    """Response model for crawl-and-summarize"""
+    summary: str
+    main_topic: str
+    pages: list[CrawlPageSummary]
+    pages_crawled: int
+    fetch_errors: int = 0
+    duplicates_skipped: int
+    summaries_failed: int = 0
+    session_id: Optional[str] = None
 
 class ChatRequest(BaseModel):
     """Request model for chat with summary"""
@@ -38,6 +68,7 @@ class ChatResponse(BaseModel):
     """Response model for chat interaction"""
     answer: str
     session_id: str
+    cached_input_tokens: int = 0
 
 class ConversationRequest(BaseModel):
     """Request model for conversation questions"""
@@ -2,10 +2,26 @@
 Script to run the Webpage Summarizer API
 """
 
+import argparse
+import os
 import uvicorn
 from src.utils.utils import ensure_project_root, create_env_template, check_dependencies
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the Webpage Summarizer API")
+    parser.add_argument(
+        "--mode",
+        choices=["dev", "prod"],
+        default="dev",
+        help="dev: single process with auto-reload; prod: prefork workers with graceful drain"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes in prod mode (overrides config)")
+    parser.add_argument("--host", default=None, help="Bind address (overrides config)")
+    parser.add_argument("--port", type=int, default=None, help="Bind port (overrides config)")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     print("🚀 Starting Webpage Summarizer API...")
     
     # Check if we're in the right directory
@@ -18,18 +34,49 @@ def main():
     # Create .env template if needed
     create_env_template()
     
+    from src.config.settings import load_config
+    server_config = load_config()["server"]
+    host = args.host or server_config["host"]
+    port = args.port or server_config["port"]
+    
     # Run the FastAPI server
     print("🌐 Starting API server...")
-    print("📖 API Documentation: http://localhost:8000/docs")
+    print(f"📖 API Documentation: http://localhost:{port}/docs")
     print("⏹️  Press Ctrl+C to stop the server")
     
+    if args.mode == "dev":
+        uvicorn.run(
+            "src.api.server:app",
+            host=host,
+            port=port,
+            reload=True,
+            log_level="info"
+        )
+        return 0
+    
+    workers = args.workers if args.workers is not None else server_config["workers"]
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    
+    print(f"🏭 Production mode: {workers} worker(s), readiness probe at /ready")
+    drain = server_config['graceful_timeout']
+    if workers > 1:
+        print(f"♻️  Graceful restart: kill -HUP {os.getpid()} (in-flight requests drain for up to {drain}s)")
+        print("⚠️  Chat sessions live in worker memory, so /chat may reach a worker without the session; use --workers 1 if you rely on /chat")
+    else:
+        # A single worker runs without uvicorn's supervisor, which is what handles SIGHUP
+        print(f"♻️  Graceful stop: kill -TERM {os.getpid()} (in-flight requests drain for up to {drain}s); restart via your process manager")
+    
     uvicorn.run(
         "src.api.server:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_graceful_shutdown=server_config["graceful_timeout"],
+        timeout_keep_alive=server_config["keep_alive_timeout"],
         log_level="info"
     )
+    return 0
 
 if __name__ == "__main__":
     exit(main())
@@ -0,0 +1,51 @@
+"""
+Script to load-test the Webpage Summarizer API against local stand-ins
+"""
+
+import argparse
+from src.utils.utils import ensure_project_root
+
+def parse_args(config):
+    settings = config["loadtest"]
+    parser = argparse.ArgumentParser(description="Load-test the API with a fixture site and fake LLM providers")
+    parser.add_argument("--provider", choices=["openai", "anthropic"], default=settings["provider"],
+                        help="Fake provider the app talks to")
+    parser.add_argument("--model", default=None, help="Model name sent to the fake provider (defaults to the provider default)")
+    parser.add_argument("--stages", default=",".join(str(c) for c in settings["stages"]),
+                        help="Comma-separated concurrent sessions per ramp stage, e.g. 1,2,4,8")
+    parser.add_argument("--stage-seconds", type=float, default=settings["stage_seconds"])
+    parser.add_argument("--chat-turns", type=int, default=settings["chat_turns"], help="/chat calls after each /summarize")
+    parser.add_argument("--app-workers", type=int, default=settings["app_workers"], help="uvicorn worker processes")
+    parser.add_argument("--output", default=settings["output"], help="Where to write the JSON results")
+    return parser.parse_args()
+
+def main():
+    ensure_project_root()
+    
+    from src.config.settings import load_config
+    from src.loadtest.harness import run_load_test, write_results
+    
+    config = load_config()
+    args = parse_args(config)
+    model = args.model or config["llm_providers"][args.provider]["default_model"]
+    stages = [int(c) for c in args.stages.split(",") if c.strip()]
+    
+    print("🚦 Starting load test...")
+    if args.app_workers > 1 and args.chat_turns:
+        print("⚠️  Chat sessions live in one worker's memory: /chat calls that reach another worker are "
+              "reported as session misses, not errors, and do not count towards saturation")
+    results = run_load_test(config, args.provider, model, stages, args.stage_seconds, args.chat_turns, args.app_workers)
+    write_results(results, args.output)
+    
+    status, concurrency = results["saturation_status"], results["saturation_concurrency"]
+    if status == "reached":
+        print(f"🧭 Saturation concurrency: {concurrency}")
+    elif status == "degraded_at_first_stage":
+        print("🧭 Saturation concurrency: below the first stage (already over the error or p99 budget)")
+    else:
+        print(f"🧭 Saturation concurrency: not reached (still scaling at {concurrency})")
+    print(f"💾 Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
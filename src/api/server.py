@@ -1,9 +1,18 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+import os
+import signal
+import threading
+import time
 import uvicorn
 import uuid
 from models import (
     SummarizeRequest,
     SummarizeResponse,
+    CrawlRequest,
+    CrawlPageSummary,
+    CrawlResponse,
     ChatRequest,
     ChatResponse,
     ConversationRequest,
@@ -11,22 +20,79 @@ from models import (
     ProvidersResponse,
     HealthResponse
 )
-from src.config.settings import load_config
-from src.core.web_scraper import validate_url, fetch_and_clean_content
-from src.core.text_processor import summarize_content
+from src.config.settings import get_config
+from src.core.web_scraper import validate_url, fetch_and_clean_content, warm_up_scraper
+from src.core.text_processor import summarize_content, warm_up_summarizer
+from src.core.compressor import compress_for_summary, summary_input_tokens
+from src.core.crawler import crawl_site, summarize_crawl
+from src.core.incremental import get_previous_result, remember_result, diff_blocks, build_update_content
+from src.utils.utils import estimate_tokens
+from src.utils.profiling import ProfilingMiddleware, get_slowest_requests, profile_path, stage
 from src.core.llm_manager import (
     get_available_providers,
-    create_llm,
+    get_llm,
     create_conversation_chain,
     add_summary_to_memory
 )
 
+worker_state = {"ready": False}
+
+def warm_up_worker():
+    start_time = time.time()
+    
+    config = get_config()
+    warm_up_scraper()
+    warm_up_summarizer()
+    
+    for provider_name, provider_config in get_available_providers(config).items():
+        try:
+            get_llm(provider_name, provider_config["default_model"])
+        except Exception as e:
+            print(f"⚠️ Could not warm up {provider_name} client: {e}")
+    
+    print(f"🔥 Worker {os.getpid()} warmed up in {time.time() - start_time:.2f}s")
+
+def drain_on_sigterm(drain_seconds):
+    # Uvicorn only accepts connections after lifespan startup and closes its listener before
+    # lifespan shutdown, so the one window where /ready can differ from /health is a drain:
+    # on SIGTERM the worker reports not-ready but keeps serving for drain_seconds, letting the
+    # load balancer stop routing to it, and only then hands the signal to uvicorn
+    if drain_seconds <= 0 or threading.current_thread() is not threading.main_thread():
+        return
+    uvicorn_handler = signal.getsignal(signal.SIGTERM)
+    if not callable(uvicorn_handler):
+        return
+    
+    def handle_sigterm(sig, frame):
+        if not worker_state["ready"]:
+            # A second SIGTERM skips the rest of the drain
+            uvicorn_handler(sig, frame)
+            return
+        worker_state["ready"] = False
+        print(f"🚧 Worker {os.getpid()} draining: /ready returns 503 for {drain_seconds}s before shutdown")
+        timer = threading.Timer(drain_seconds, uvicorn_handler, args=(sig, frame))
+        timer.daemon = True
+        timer.start()
+    
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+@asynccontextmanager
+async def lifespan(app):
+    warm_up_worker()
+    drain_on_sigterm(get_config()["server"]["readiness_drain_seconds"])
+    worker_state["ready"] = True
+    yield
+    worker_state["ready"] = False
+
 app = FastAPI(
     title="Webpage Summarizer API",
     description="API for summarizing webpages using multiple LLM providers",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+app.add_middleware(ProfilingMiddleware, settings=get_config()["profiling"])
+
 conversation_sessions = {}
 
 @app.get("/")
@@ -36,14 +102,17 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/summarize": "POST - Summarize a webpage",
+            "/crawl": "POST - Crawl a site section and summarize every page",
             "/providers": "GET - List available providers",
-            "/conversation": "POST - Ask follow-up questions"
+            "/conversation": "POST - Ask follow-up questions",
+            "/health": "GET - Liveness check",
+            "/ready": "GET - Readiness check (503 while the worker drains before shutdown)"
         }
     }
 
 @app.get("/providers", response_model=ProvidersResponse)
 async def get_providers():
-    config = load_config()
+    config = get_config()
     available_providers = get_available_providers(config)
     
     providers_info = {}
@@ -58,9 +127,26 @@ async def get_providers():
         total_providers=len(providers_info)
     )
 
+def select_provider(config, requested_provider, requested_model):
+    available_providers = get_available_providers(config)
+    
+    if requested_provider and requested_provider in available_providers:
+        provider_name = requested_provider
+        provider_config = available_providers[provider_name]
+        if requested_model and requested_model in provider_config["models"]:
+            selected_model = requested_model
+        else:
+            selected_model = provider_config["default_model"]
+    else:
+        provider_name = list(available_providers.keys())[0]
+        provider_config = available_providers[provider_name]
+        selected_model = provider_config["default_model"]
+    
+    return provider_name, selected_model
+
 @app.post("/summarize", response_model=SummarizeResponse)
-async def summarize_page(request: SummarizeRequest):
-    config = load_config()
+def summarize_page(request: SummarizeRequest):
+    config = get_config()
     
     from src.config.settings import get_api_key, get_azure_endpoint
     valid_keys = []
@@ -75,22 +161,11 @@ async def summarize_page(request: SummarizeRequest):
             valid_keys.append(provider)
 
     
-    available_providers = get_available_providers(config)
-    
-    requested_provider = getattr(request, 'provider', None)
-    requested_model = getattr(request, 'model', None)
-    
-    if requested_provider and requested_provider in available_providers:
-        provider_name = requested_provider
-        provider_config = available_providers[provider_name]
-        if requested_model and requested_model in provider_config["models"]:
-            selected_model = requested_model
-        else:
-            selected_model = provider_config["default_model"]
-    else:
-        provider_name = list(available_providers.keys())[0]
-        provider_config = available_providers[provider_name]
-        selected_model = provider_config["default_model"]
+    provider_name, selected_model = select_provider(
+        config,
+        getattr(request, 'provider', None),
+        getattr(request, 'model', None)
+    )
     
     url_str = str(request.url)
     
@@ -98,16 +173,54 @@ async def summarize_page(request: SummarizeRequest):
     if not is_valid:
         raise HTTPException(status_code=400, detail=message)
     
-    content, error = fetch_and_clean_content(url_str, config)
+    scrape_stats = {}
+    content, error = fetch_and_clean_content(url_str, config, stats=scrape_stats)
     if error:
         raise HTTPException(status_code=422, detail=error)
     
-    llm = create_llm(provider_name, selected_model, config)
-    summary, main_topic = summarize_content(content, llm)
+    llm = get_llm(provider_name, selected_model)
+    llm_stats = {}
+    diff_ratio = None
+    incremental_tokens_saved = 0
+    
+    previous = get_previous_result(url_str) if config["incremental"]["enabled"] else None
+    if previous is not None:
+        with stage("diff"):
+            diff_ratio, changed, removed = diff_blocks(previous["text"], content)
+    
+    summary = None
+    if diff_ratio is not None and not changed and not removed:
+        print("♻️ Page unchanged since last visit - reusing previous summary")
+        summary, main_topic = previous["summary"], previous["topic"]
+        incremental_tokens_saved = summary_input_tokens(content, config)
+    elif diff_ratio is not None and diff_ratio <= config["incremental"]["max_change_ratio"]:
+        update_content = build_update_content(previous, changed, removed)
+        update_tokens = estimate_tokens(update_content)
+        full_tokens = summary_input_tokens(content, config)
+        if update_tokens >= full_tokens:
+            # On long pages a small ratio can still mean more changed text than the compressed page
+            print(f"♻️ Page changed by {diff_ratio:.1%} but the update ({update_tokens} tokens) "
+                  f"costs more than a full summary ({full_tokens} tokens)")
+        else:
+            print(f"♻️ Page changed by {diff_ratio:.1%} - updating previous summary")
+            summary, main_topic = summarize_content(update_content, llm, stats=llm_stats)
+            if llm_stats.pop("parse_failed", False):
+                # The fallback result is the update prompt itself, never a summary
+                print("⚠️ Summary update failed - falling back to a full summary")
+                summary = None
+            else:
+                incremental_tokens_saved = full_tokens - update_tokens
+    
+    if summary is None:
+        summary_input = compress_for_summary(content, config, stats=scrape_stats)
+        summary, main_topic = summarize_content(summary_input, llm, stats=llm_stats)
     
     if summary.startswith("Error"):
         raise HTTPException(status_code=500, detail=summary)
     
+    if not llm_stats.get("parse_failed"):
+        remember_result(url_str, content, summary, main_topic, config)
+    
     conversation_chain = create_conversation_chain(provider_name, selected_model, config)
     add_summary_to_memory(conversation_chain, summary, url_str)
     
@@ -122,11 +235,60 @@ async def summarize_page(request: SummarizeRequest):
     return SummarizeResponse(
         summary=summary,
         main_topic=main_topic,
+        session_id=session_id,
+        boilerplate_bytes_saved=scrape_stats.get("boilerplate_bytes_saved", 0),
+        boilerplate_tokens_saved=scrape_stats.get("boilerplate_tokens_saved", 0),
+        compression_tokens_saved=scrape_stats.get("compression_tokens_saved", 0),
+        diff_ratio=diff_ratio,
+        incremental_tokens_saved=incremental_tokens_saved,
+        cached_input_tokens=llm_stats.get("cached_input_tokens", 0)
+    )
+
+@app.post("/crawl", response_model=CrawlResponse)
+def crawl_and_summarize(request: CrawlRequest):
+    # Sync endpoint: FastAPI runs it in the threadpool, so a long crawl does not block the event loop
+    config = get_config()
+    provider_name, selected_model = select_provider(config, request.provider, request.model)
+    
+    url_str = str(request.url)
+    
+    is_valid, message = validate_url(url_str, config)
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=message)
+    
+    pages, crawl_stats = crawl_site(url_str, config, max_pages=request.max_pages)
+    if not pages:
+        raise HTTPException(status_code=422, detail="No readable pages found while crawling")
+    
+    llm = get_llm(provider_name, selected_model)
+    page_summaries, summary, main_topic, summaries_failed = summarize_crawl(pages, llm, config)
+    if summary is None:
+        raise HTTPException(status_code=502, detail="The LLM did not return a usable summary for the crawled pages")
+    
+    conversation_chain = create_conversation_chain(provider_name, selected_model, config)
+    add_summary_to_memory(conversation_chain, summary, url_str)
+    
+    session_id = str(uuid.uuid4())
+    conversation_sessions[session_id] = {
+        'conversation_chain': conversation_chain,
+        'summary': summary,
+        'topic': main_topic,
+        'url': url_str
+    }
+    
+    return CrawlResponse(
+        summary=summary,
+        main_topic=main_topic,
+        pages=[CrawlPageSummary(**page) for page in page_summaries],
+        pages_crawled=crawl_stats["pages_fetched"],
+        fetch_errors=crawl_stats["errors"],
+        duplicates_skipped=crawl_stats["duplicates_skipped"],
+        summaries_failed=summaries_failed,
         session_id=session_id
     )
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat_with_summary(request: ChatRequest):
+def chat_with_summary(request: ChatRequest):
     if request.session_id not in conversation_sessions:
         raise HTTPException(status_code=404, detail="Chat session not found. Please summarize a webpage first.")
     
@@ -134,13 +296,18 @@ async def chat_with_summary(request: ChatRequest):
     conversation_chain = session_data['conversation_chain']
     
     try:
-        answer = conversation_chain.predict(input=request.question)
-        return ChatResponse(answer=answer, session_id=request.session_id)
+        chat_stats = {}
+        answer = conversation_chain.predict(input=request.question, stats=chat_stats)
+        return ChatResponse(
+            answer=answer,
+            session_id=request.session_id,
+            cached_input_tokens=chat_stats.get("cached_input_tokens", 0)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing chat: {str(e)}")
 
 @app.post("/conversation", response_model=ConversationResponse)
-async def ask_question(request: ConversationRequest):
+def ask_question(request: ConversationRequest):
     if request.session_id not in conversation_sessions:
         raise HTTPException(status_code=404, detail="Conversation session not found")
     
@@ -154,5 +321,38 @@ async def ask_question(request: ConversationRequest):
 async def health_check():
     return HealthResponse(status="healthy", service="webpage-summarizer-api")
 
+@app.get("/profiling/slowest")
+async def slowest_requests():
+    settings = get_config()["profiling"]
+    if settings["slowest_requests"] <= 0:
+        raise HTTPException(status_code=404, detail="Slow request tracking is disabled")
+    return {
+        "window_seconds": settings["slowest_window_seconds"],
+        "requests": get_slowest_requests(settings["slowest_requests"], settings["slowest_window_seconds"])
+    }
+
+@app.get("/profiling/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str):
+    settings = get_config()["profiling"]
+    if not settings["enabled"]:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not profile_id.isalnum():
+        raise HTTPException(status_code=400, detail="Invalid profile id")
+    
+    path = profile_path(settings, profile_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    with open(path, "r") as file:
+        return file.read()
+
+@app.get("/ready", response_model=HealthResponse)
+async def readiness_check():
+    if not worker_state["ready"]:
+        return JSONResponse(
+            status_code=503,
+            content=HealthResponse(status="not_ready", service="webpage-summarizer-api").model_dump()
+        )
+    return HealthResponse(status="ready", service="webpage-summarizer-api")
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
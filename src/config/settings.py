@@ -1,5 +1,6 @@
 import yaml
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,8 +13,17 @@ def load_prompts():
     with open("prompts/prompts.yaml", "r") as file:
         return yaml.safe_load(file)
 
+@lru_cache(maxsize=1)
+def get_config():
+    # Per-process snapshot taken once at worker warmup; callers must not mutate it
+    return load_config()
+
+@lru_cache(maxsize=1)
+def get_prompts():
+    return load_prompts()
+
 def get_api_key(provider_name):
-    config = load_config()
+    config = get_config()
     provider_config = config["llm_providers"][provider_name]
     return os.getenv(provider_config["api_key_env"])
 
@@ -0,0 +1,143 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+SIMHASH_BITS = 64
+BAND_BITS = 16
+BAND_MASK = (1 << BAND_BITS) - 1
+SHINGLE_SIZE = 3
+
+_TOKEN_RE = re.compile(r"[^\W\d_]+")
+
+_host_stores = OrderedDict()
+_store_lock = threading.Lock()
+
+def _hash64(token):
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+def _shingles(text):
+    # Digits are dropped so dates, counters and prices do not split otherwise identical blocks
+    words = _TOKEN_RE.findall(text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+def simhash(text):
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+
+    # Column-wise bit counts over the binary strings keep the per-bit voting out of Python loops
+    rows = [format(_hash64(shingle), "064b") for shingle in shingles]
+    half = len(rows) / 2
+    return int("".join("1" if column.count("1") > half else "0" for column in zip(*rows)), 2)
+
+def _bands(fingerprint):
+    return [(i, (fingerprint >> (i * BAND_BITS)) & BAND_MASK) for i in range(SIMHASH_BITS // BAND_BITS)]
+
+class _HostStore:
+    # Bounded LRU of block fingerprints seen on one host, with the pages each was seen on
+    def __init__(self, max_fingerprints, min_pages):
+        self.max_fingerprints = max_fingerprints
+        self.min_pages = min_pages
+        self.pages_by_fingerprint = OrderedDict()
+        self.band_index = {}
+
+    def find(self, fingerprint, max_distance):
+        # Any fingerprint within max_distance bits agrees with this one on at least one band
+        for band in _bands(fingerprint):
+            for candidate in self.band_index.get(band, ()):
+                if bin(candidate ^ fingerprint).count("1") <= max_distance:
+                    return candidate
+        return None
+
+    def is_recurring(self, fingerprint, page_key):
+        pages = self.pages_by_fingerprint.get(fingerprint)
+        if pages is None:
+            return False
+        return len(pages - {page_key}) >= self.min_pages - 1
+
+    def record(self, fingerprint, page_key):
+        pages = self.pages_by_fingerprint.get(fingerprint)
+        if pages is None:
+            pages = set()
+            self.pages_by_fingerprint[fingerprint] = pages
+            for band in _bands(fingerprint):
+                self.band_index.setdefault(band, set()).add(fingerprint)
+            if len(self.pages_by_fingerprint) > self.max_fingerprints:
+                self._evict_oldest()
+        else:
+            self.pages_by_fingerprint.move_to_end(fingerprint)
+
+        if len(pages) < self.min_pages:
+            pages.add(page_key)
+
+    def _evict_oldest(self):
+        fingerprint, _ = self.pages_by_fingerprint.popitem(last=False)
+        for band in _bands(fingerprint):
+            bucket = self.band_index.get(band)
+            if bucket is not None:
+                bucket.discard(fingerprint)
+                if not bucket:
+                    del self.band_index[band]
+
+def _get_host_store(host, settings):
+    store = _host_stores.get(host)
+    if store is None:
+        store = _HostStore(settings["max_fingerprints_per_host"], settings["min_pages"])
+        _host_stores[host] = store
+        if len(_host_stores) > settings["max_hosts"]:
+            _host_stores.popitem(last=False)
+    else:
+        _host_stores.move_to_end(host)
+    return store
+
+def strip_boilerplate(url, blocks, config):
+    # A block is dropped once a near-identical fingerprint has been seen on min_pages distinct pages
+    settings = config["boilerplate"]
+    if not settings.get("enabled", False) or not blocks:
+        return blocks
+
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    page_key = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+    max_distance = settings["max_hamming_distance"]
+    min_block_chars = settings["min_block_chars"]
+
+    hashes = [simhash(block) if len(block) >= min_block_chars else None for block in blocks]
+
+    with _store_lock:
+        store = _get_host_store(host, settings)
+
+        fingerprints = []
+        for fingerprint in hashes:
+            if fingerprint is not None:
+                match = store.find(fingerprint, max_distance)
+                if match is not None:
+                    fingerprint = match
+            fingerprints.append(fingerprint)
+
+        kept = []
+        removed_chars = 0
+        for block, fingerprint in zip(blocks, fingerprints):
+            if fingerprint is not None and store.is_recurring(fingerprint, page_key):
+                removed_chars += len(block)
+            else:
+                kept.append(block)
+
+        for fingerprint in fingerprints:
+            if fingerprint is not None:
+                store.record(fingerprint, page_key)
+
+    # The same article reached through another path looks entirely "recurring"; keep it whole
+    total_chars = sum(len(block) for block in blocks)
+    if removed_chars > total_chars * settings["max_removed_ratio"]:
+        return blocks
+
+    return kept
+
+def reset_boilerplate_store():
+    with _store_lock:
+        _host_stores.clear()
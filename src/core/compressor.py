@@ -0,0 +1,122 @@
+import re
+import string
+import time
+import numpy as np
+from src.utils.utils import estimate_tokens, CHARS_PER_TOKEN
+from src.utils.profiling import stage
+
+MAX_SENTENCE_CHARS = 600
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 30
+TEXTRANK_TOLERANCE = 1e-6
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+_LONG_SENTENCE_RE = re.compile(r'\S.{0,%d}(?=\s|$)' % (MAX_SENTENCE_CHARS - 2))
+SENTENCE_SEPARATOR = '\x00'
+_PUNCTUATION_TABLE = str.maketrans(string.punctuation, ' ' * len(string.punctuation))
+
+def split_sentences(text):
+    sentences = []
+    for sentence in _SENTENCE_RE.split(text):
+        if len(sentence) <= MAX_SENTENCE_CHARS:
+            if sentence:
+                sentences.append(sentence)
+        else:
+            # Scraped text often has long runs without punctuation (lists, tables, headings)
+            sentences.extend(piece.strip() for piece in _LONG_SENTENCE_RE.findall(sentence))
+    return sentences
+
+def _tfidf_matrix(sentences):
+    # Sparse sentence x term TF-IDF matrix in COO form, rows L2-normalised.
+    # Terms are identified by their string hash so tokenising and vocabulary
+    # building stay in C; the separator token marks sentence boundaries
+    tokens = f' {SENTENCE_SEPARATOR} '.join(sentences).lower().translate(_PUNCTUATION_TABLE).split()
+    token_hashes = np.fromiter(map(hash, tokens), dtype=np.int64, count=len(tokens))
+
+    is_separator = token_hashes == hash(SENTENCE_SEPARATOR)
+    rows = np.cumsum(is_separator)[~is_separator]
+    terms, cols = np.unique(token_hashes[~is_separator], return_inverse=True)
+
+    n_sentences = len(sentences)
+    n_terms = len(terms)
+    if not n_terms:
+        return None
+
+    keys, counts = np.unique(rows * n_terms + cols, return_counts=True)
+    rows = keys // n_terms
+    cols = keys % n_terms
+
+    document_frequency = np.bincount(cols, minlength=n_terms)
+    idf = np.log((1.0 + n_sentences) / (1.0 + document_frequency)) + 1.0
+    values = (1.0 + np.log(counts)) * idf[cols]
+
+    norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=n_sentences))
+    norms[norms == 0] = 1.0
+    values = values / norms[rows]
+    return rows, cols, values, n_sentences, n_terms
+
+def score_sentences(sentences):
+    # TextRank over cosine similarities S = X X^T - I, applied as two sparse
+    # mat-vec products per iteration so the n x n matrix is never materialised
+    matrix = _tfidf_matrix(sentences)
+    if matrix is None:
+        return np.zeros(len(sentences))
+    rows, cols, values, n_sentences, n_terms = matrix
+
+    def similarity_dot(vector):
+        term_weights = np.bincount(cols, weights=values * vector[rows], minlength=n_terms)
+        return np.bincount(rows, weights=values * term_weights[cols], minlength=n_sentences) - vector
+
+    degree = similarity_dot(np.ones(n_sentences))
+    degree[degree <= 0] = 1.0
+
+    scores = np.full(n_sentences, 1.0 / n_sentences)
+    for _ in range(TEXTRANK_ITERATIONS):
+        updated = (1.0 - TEXTRANK_DAMPING) / n_sentences + TEXTRANK_DAMPING * similarity_dot(scores / degree)
+        if np.abs(updated - scores).sum() < TEXTRANK_TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+def compress_text(text, target_tokens):
+    sentences = split_sentences(text.replace(SENTENCE_SEPARATOR, ' '))
+    if not sentences:
+        return text
+
+    scores = score_sentences(sentences)
+    lengths = np.array([len(sentence) + 1 for sentence in sentences])
+
+    # Highest-scoring sentences first, kept while the running total stays within budget
+    order = np.argsort(-scores, kind='stable')
+    budget_chars = target_tokens * CHARS_PER_TOKEN
+    fits = np.cumsum(lengths[order]) <= budget_chars
+    selected = np.sort(order[fits])
+
+    return ' '.join(sentences[i] for i in selected)
+
+def summary_input_tokens(text, config):
+    # Tokens a full summarization of text would send, i.e. after compress_for_summary
+    settings = config["text_processing"]["compression"]
+    original_tokens = estimate_tokens(text)
+    if not settings.get("enabled", False):
+        return original_tokens
+    return min(original_tokens, settings["target_tokens"])
+
+def compress_for_summary(text, config, stats=None):
+    settings = config["text_processing"]["compression"]
+    target_tokens = settings["target_tokens"]
+    original_tokens = estimate_tokens(text)
+
+    if not settings.get("enabled", False) or original_tokens <= target_tokens:
+        return text
+
+    start_time = time.time()
+    with stage("compress"):
+        compressed = compress_text(text, target_tokens)
+    compressed_tokens = estimate_tokens(compressed)
+
+    if stats is not None:
+        stats["compression_tokens_saved"] = original_tokens - compressed_tokens
+    print(f"🗜️ Compressed {original_tokens} → {compressed_tokens} tokens in {(time.time() - start_time) * 1000:.0f}ms")
+    return compressed
@@ -0,0 +1,210 @@
+import contextvars
+import re
+import threading
+import time
+import concurrent.futures
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse, urlunparse, urldefrag
+from src.core.web_scraper import fetch_and_clean_content, get_http_session, build_request_headers
+from src.core.boilerplate import simhash
+from src.core.compressor import compress_for_summary
+from src.core.text_processor import summarize_content
+
+SKIPPED_EXTENSIONS = (
+    '.pdf', '.zip', '.gz', '.tar', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico',
+    '.css', '.js', '.json', '.xml', '.rss', '.mp3', '.mp4', '.avi', '.mov', '.woff', '.woff2'
+)
+MAX_NESTED_SITEMAPS = 5
+
+_SITEMAP_LOC_RE = re.compile(r'<loc>\s*(.*?)\s*</loc>', re.IGNORECASE | re.DOTALL)
+
+class HostThrottle:
+    # Caps concurrent requests per host and spaces their start times by min_delay seconds
+    def __init__(self, max_concurrency, min_delay):
+        self.max_concurrency = max_concurrency
+        self.min_delay = min_delay
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+
+    @contextmanager
+    def slot(self, host):
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_concurrency))
+
+        semaphore.acquire()
+        try:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.min_delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+        finally:
+            semaphore.release()
+
+def normalize_url(url):
+    url, _ = urldefrag(url)
+    parsed = urlparse(url)
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path or '/', '', parsed.query, ''))
+
+def section_prefix(seed_url):
+    path = urlparse(seed_url).path or '/'
+    return path[:path.rfind('/') + 1]
+
+def in_scope(url, seed_url, config):
+    parsed = urlparse(url)
+    seed = urlparse(seed_url)
+    if (parsed.scheme, parsed.netloc) != (seed.scheme, seed.netloc.lower()):
+        return False
+    if parsed.path.lower().endswith(SKIPPED_EXTENSIONS):
+        return False
+    if config["crawl"]["restrict_to_section"]:
+        return parsed.path.startswith(section_prefix(seed_url))
+    return True
+
+def discover_sitemap_urls(seed_url, config, throttle):
+    seed = urlparse(seed_url)
+    sitemaps = deque([f"{seed.scheme}://{seed.netloc}/sitemap.xml"])
+    fetched = 0
+    urls = []
+
+    while sitemaps and fetched < MAX_NESTED_SITEMAPS:
+        sitemap_url = sitemaps.popleft()
+        fetched += 1
+        try:
+            with throttle.slot(urlparse(sitemap_url).netloc):
+                response = get_http_session().get(
+                    sitemap_url,
+                    headers=build_request_headers(config),
+                    timeout=min(config["scraping"]["timeout"], 10)
+                )
+            if response.status_code != 200:
+                continue
+        except Exception as e:
+            print(f"⚠️ Could not read sitemap {sitemap_url}: {e}")
+            continue
+
+        for loc in _SITEMAP_LOC_RE.findall(response.text):
+            # Sitemap indexes list further sitemaps rather than pages
+            if loc.lower().endswith('.xml'):
+                sitemaps.append(loc)
+            else:
+                urls.append(loc)
+
+    return urls
+
+def _fetch_page(url, config, throttle):
+    page = {}
+    with throttle.slot(urlparse(url).netloc):
+        text, error = fetch_and_clean_content(url, config, page=page)
+    return text, error, page
+
+def crawl_site(seed_url, config, max_pages=None):
+    crawl_config = config["crawl"]
+    # Requests may ask for fewer pages than the configured budget, never more
+    max_pages = min(max_pages or crawl_config["max_pages"], crawl_config["max_pages"])
+    max_workers = crawl_config["max_workers"]
+    max_distance = crawl_config["dedup_max_hamming_distance"]
+    throttle = HostThrottle(crawl_config["per_host_concurrency"], crawl_config["per_host_delay"])
+
+    start_time = time.time()
+    seed_url = normalize_url(seed_url)
+    seen = {seed_url}
+    frontier = deque([seed_url])
+
+    if crawl_config["use_sitemap"]:
+        for url in discover_sitemap_urls(seed_url, config, throttle):
+            url = normalize_url(url)
+            if url not in seen and in_scope(url, seed_url, config):
+                seen.add(url)
+                frontier.append(url)
+
+    pages = []
+    fingerprints = []
+    # pages_requested counts against the budget; pages_fetched only counts successful fetches
+    stats = {"pages_requested": 0, "pages_fetched": 0, "duplicates_skipped": 0, "errors": 0}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}
+        while frontier or in_flight:
+            while frontier and len(in_flight) < max_workers and stats["pages_requested"] < max_pages:
+                url = frontier.popleft()
+                # Pool threads do not inherit context variables; copy them so stage() timings
+                # and the request profiler follow the work into the fetch threads
+                future = executor.submit(contextvars.copy_context().run, _fetch_page, url, config, throttle)
+                in_flight[future] = url
+                stats["pages_requested"] += 1
+
+            if not in_flight:
+                break
+
+            done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                url = in_flight.pop(future)
+                text, error, page = future.result()
+
+                for link in page.get("links", []):
+                    link = normalize_url(link)
+                    if link not in seen and in_scope(link, seed_url, config):
+                        seen.add(link)
+                        frontier.append(link)
+
+                if error:
+                    print(f"⚠️ Skipping {url}: {error}")
+                    stats["errors"] += 1
+                    continue
+                stats["pages_fetched"] += 1
+
+                # Fingerprint the text before boilerplate stripping: the per-domain learner
+                # only strips shared blocks from later pages, so identical pages can differ after it
+                fingerprint = simhash(page["full_text"])
+                if fingerprint is not None and any(
+                    bin(fingerprint ^ other).count("1") <= max_distance for other in fingerprints
+                ):
+                    stats["duplicates_skipped"] += 1
+                    continue
+                if fingerprint is not None:
+                    fingerprints.append(fingerprint)
+
+                pages.append({"url": url, "text": text})
+
+    stats["elapsed_seconds"] = time.time() - start_time
+    print(f"🕸️ Fetched {stats['pages_fetched']} pages in {stats['elapsed_seconds']:.2f}s - "
+          f"{len(pages)} unique, {stats['duplicates_skipped']} duplicates, {stats['errors']} errors")
+    return pages, stats
+
+def summarize_crawl(pages, llm, config):
+    # Pages whose summary failed are left out of the rollup; summary is None when nothing usable came back
+    def summarize_page(page):
+        page_stats = {}
+        summary, topic = summarize_content(compress_for_summary(page["text"], config), llm, stats=page_stats)
+        if page_stats.get("parse_failed"):
+            return None
+        return {"url": page["url"], "summary": summary, "main_topic": topic}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=config["crawl"]["summary_workers"]) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, summarize_page, page) for page in pages]
+        results = [future.result() for future in futures]
+
+    page_summaries = [result for result in results if result is not None]
+    failed = len(results) - len(page_summaries)
+    if failed:
+        print(f"⚠️ {failed} of {len(results)} page summaries failed and were left out")
+
+    if not page_summaries:
+        return page_summaries, None, None, failed
+    if len(page_summaries) == 1:
+        return page_summaries, page_summaries[0]["summary"], page_summaries[0]["main_topic"], failed
+
+    rollup_content = "\n\n".join(
+        f"Page: {page['url']}\nTopic: {page['main_topic']}\nSummary: {page['summary']}"
+        for page in page_summaries
+    )
+    rollup_stats = {}
+    summary, topic = summarize_content(compress_for_summary(rollup_content, config), llm, stats=rollup_stats)
+    if rollup_stats.get("parse_failed"):
+        return page_summaries, None, None, failed
+    return page_summaries, summary, topic, failed
@@ -0,0 +1,102 @@
+import difflib
+import threading
+from collections import OrderedDict
+from src.config.settings import get_prompts
+from src.core.compressor import split_sentences
+
+MAX_DIFF_BLOCKS = 8000
+
+_previous_results = OrderedDict()
+_results_lock = threading.Lock()
+_stored_chars = 0
+
+def get_previous_result(url):
+    with _results_lock:
+        entry = _previous_results.get(url)
+        if entry is not None:
+            _previous_results.move_to_end(url)
+        return entry
+
+def _forget(url):
+    global _stored_chars
+    entry = _previous_results.pop(url, None)
+    if entry is not None:
+        _stored_chars -= len(entry["text"])
+
+def remember_result(url, text, summary, topic, config):
+    # LRU bounded by page count and by total stored text, so memory per worker stays capped
+    global _stored_chars
+    settings = config["incremental"]
+    if not settings["enabled"]:
+        return
+    with _results_lock:
+        _forget(url)
+        if len(text) > settings["max_page_chars"]:
+            return
+        _previous_results[url] = {"text": text, "summary": summary, "topic": topic}
+        _stored_chars += len(text)
+        while len(_previous_results) > settings["max_urls"] or _stored_chars > settings["max_total_chars"]:
+            _forget(next(iter(_previous_results)))
+
+def reset_previous_results():
+    global _stored_chars
+    with _results_lock:
+        _previous_results.clear()
+        _stored_chars = 0
+
+def _block_opcodes(old_hashes, new_hashes):
+    # Trim the shared head and tail first: most page edits touch a few blocks, and
+    # the remaining middle goes to SequenceMatcher with autojunk so blocks that repeat
+    # across the page (changelog entries, table cells) cannot make it quadratic
+    limit = min(len(old_hashes), len(new_hashes))
+    prefix = 0
+    while prefix < limit and old_hashes[prefix] == new_hashes[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_hashes[-1 - suffix] == new_hashes[-1 - suffix]:
+        suffix += 1
+    old_end = len(old_hashes) - suffix
+    new_end = len(new_hashes) - suffix
+
+    opcodes = [('equal', 0, prefix, 0, prefix)]
+    if (old_end - prefix) + (new_end - prefix) > MAX_DIFF_BLOCKS:
+        # Too large to align cheaply; treated as rewritten, which routes to a full summary
+        opcodes.append(('replace', prefix, old_end, prefix, new_end))
+    else:
+        matcher = difflib.SequenceMatcher(None, old_hashes[prefix:old_end], new_hashes[prefix:new_end])
+        opcodes.extend(
+            (tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        )
+    opcodes.append(('equal', old_end, len(old_hashes), new_end, len(new_hashes)))
+    return opcodes
+
+def diff_blocks(old_text, new_text):
+    # Block-level diff over sentences; the ratio is the share of characters on either side not matched
+    old_blocks = split_sentences(old_text)
+    new_blocks = split_sentences(new_text)
+
+    equal_chars = 0
+    changed = []
+    removed = []
+    for tag, i1, i2, j1, j2 in _block_opcodes(list(map(hash, old_blocks)), list(map(hash, new_blocks))):
+        if tag == 'equal':
+            equal_chars += sum(len(block) for block in old_blocks[i1:i2])
+            continue
+        if i2 > i1:
+            removed.append(' '.join(old_blocks[i1:i2]))
+        if j2 > j1:
+            changed.append(' '.join(new_blocks[j1:j2]))
+
+    total_chars = sum(len(block) for block in old_blocks) + sum(len(block) for block in new_blocks)
+    ratio = 1.0 - (2.0 * equal_chars / total_chars) if total_chars else 0.0
+    return ratio, changed, removed
+
+def build_update_content(previous, changed, removed):
+    template = get_prompts()["update_summary"]["user"]
+    return template.format(
+        topic=previous["topic"],
+        summary=previous["summary"],
+        changed='\n\n'.join(changed) or "(none)",
+        removed='\n\n'.join(removed) or "(none)"
+    )
@@ -2,8 +2,14 @@ from langchain_openai import ChatOpenAI, AzureChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.memory import ConversationBufferWindowMemory
-from langchain.chains import ConversationChain
-from src.config.settings import get_api_key
+from langchain_core.messages import SystemMessage, HumanMessage
+from functools import lru_cache
+from src.config.settings import get_api_key, get_config, get_prompts
+from src.utils.profiling import stage
+
+# Providers whose prompt caching needs explicit breakpoints; OpenAI, Azure OpenAI and
+# Gemini cache stable prefixes automatically, so for them a byte-identical prefix is enough
+CACHE_CONTROL_LLM_TYPES = {"anthropic-chat"}
 
 def get_available_providers(config):
     available = {}
@@ -61,13 +67,62 @@ def create_llm(provider_name, model_name, config):
     else:
         raise ValueError(f"Unsupported provider: {provider_name}")
 
+@lru_cache(maxsize=None)
+def get_llm(provider_name, model_name):
+    # Reuses one client (and its HTTP connection pool) per provider/model within a worker
+    return create_llm(provider_name, model_name, get_config())
+
+def cached_system_message(text, llm):
+    if getattr(llm, "_llm_type", None) in CACHE_CONTROL_LLM_TYPES:
+        return SystemMessage(content=[
+            {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+        ])
+    return SystemMessage(content=text)
+
+def record_token_usage(response, stats):
+    usage = getattr(response, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    
+    stats["input_tokens"] = stats.get("input_tokens", 0) + usage.get("input_tokens", 0)
+    stats["cached_input_tokens"] = stats.get("cached_input_tokens", 0) + details.get("cache_read", 0)
+    stats["cache_creation_tokens"] = stats.get("cache_creation_tokens", 0) + details.get("cache_creation", 0)
+    return stats
+
+class SummaryConversation:
+    # The summary is pinned in a per-session system prefix that stays byte-identical on every
+    # turn, so providers can serve it from their prompt cache; only the recent window varies
+    def __init__(self, llm, memory):
+        self.llm = llm
+        self.memory = memory
+        self.system_message = None
+        self.usage = {}
+    
+    def set_context(self, context):
+        system_prompt = get_prompts()["conversation"]["system"] + f"\n\n{context}"
+        self.system_message = cached_system_message(system_prompt, self.llm)
+    
+    def predict(self, input, stats=None):
+        messages = [self.system_message] if self.system_message is not None else []
+        messages += self.memory.load_memory_variables({})["history"]
+        messages.append(HumanMessage(content=input))
+        
+        with stage("llm"):
+            response = self.llm.invoke(messages)
+        record_token_usage(response, self.usage)
+        if stats is not None:
+            record_token_usage(response, stats)
+        
+        answer = response.content if isinstance(response.content, str) else response.text()
+        self.memory.save_context({"input": input}, {"output": answer})
+        return answer
+
 def create_conversation_chain(provider_name, model_name, config, memory_window=3):
-    llm = create_llm(provider_name, model_name, config)
+    llm = get_llm(provider_name, model_name)
     memory = ConversationBufferWindowMemory(k=memory_window, return_messages=True)
     
-    conversation = ConversationChain(llm=llm, memory=memory, verbose=False)
+    conversation = SummaryConversation(llm=llm, memory=memory)
     return conversation
 
 def add_summary_to_memory(conversation_chain, summary, url):
     context = f"I summarized the webpage at {url}. Here's the summary: {summary}"
-    conversation_chain.predict(input=context)
+    conversation_chain.set_context(context)
@@ -1,24 +1,39 @@
+from functools import lru_cache
 from langchain_core.output_parsers import PydanticOutputParser
-from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.messages import HumanMessage
 from models import StructuredSummary
-from src.config.settings import load_prompts
+from src.config.settings import get_prompts
+from src.core.llm_manager import cached_system_message, record_token_usage
+from src.utils.profiling import stage
 
-def summarize_content(content, llm):
+@lru_cache(maxsize=1)
+def get_summary_parser():
+    return PydanticOutputParser(pydantic_object=StructuredSummary)
+
+@lru_cache(maxsize=1)
+def get_summarize_system_prompt():
+    # Built once per process so the static prefix is byte-identical on every call
+    return get_prompts()["summarize"]["system"] + f"\n\n{get_summary_parser().get_format_instructions()}"
+
+def warm_up_summarizer():
+    get_summarize_system_prompt()
+
+def summarize_content(content, llm, stats=None):
     print(f"🤖 Summarizing {len(content)} characters with structured output")
     
-    prompts = load_prompts()
-    parser = PydanticOutputParser(pydantic_object=StructuredSummary)
-    
-    system_prompt = prompts["summarize"]["system"] + f"\n\n{parser.get_format_instructions()}"
+    parser = get_summary_parser()
     user_prompt = f"Content: {content}"
     
     messages = [
-        SystemMessage(content=system_prompt),
+        cached_system_message(get_summarize_system_prompt(), llm),
         HumanMessage(content=user_prompt)
     ]
     
     try:
-        response = llm.invoke(messages)
+        with stage("llm"):
+            response = llm.invoke(messages)
+        if stats is not None:
+            record_token_usage(response, stats)
         
         if hasattr(response, 'content'):
             response_text = response.content
@@ -60,4 +75,6 @@ def summarize_content(content, llm):
                 
         except Exception as e2:
             print(f"⚠️ Manual JSON parsing also failed: {e2}")
+            if stats is not None:
+                stats["parse_failed"] = True
             return content, "Content Analysis"
\ No newline at end of file
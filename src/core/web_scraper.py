@@ -1,8 +1,32 @@
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from bs4 import BeautifulSoup, NavigableString
+from urllib.parse import urlparse, urljoin, urldefrag
 import concurrent.futures
+import threading
 import time
+from src.core.boilerplate import strip_boilerplate
+from src.utils.utils import estimate_tokens
+from src.utils.profiling import stage
+
+BLOCK_TAGS = {
+    'p', 'div', 'section', 'article', 'main', 'li', 'ul', 'ol', 'table', 'tr', 'td', 'th',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'pre', 'dl', 'dt', 'dd', 'figure', 'figcaption'
+}
+
+_thread_local = threading.local()
+
+def get_http_session():
+    # One pooled session per thread keeps connections alive across requests to the same host
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _thread_local.session = session
+    return session
+
+def warm_up_scraper():
+    get_http_session()
+    soup = BeautifulSoup("<html><body><main><p>warmup</p></main></body></html>", 'lxml')
+    fast_clean_text(extract_main_content(soup))
 
 def validate_url(url, config):
     parsed = urlparse(url)
@@ -30,48 +54,105 @@ def extract_main_content(soup):
     
     return soup.find('body') or soup
 
-def fast_clean_text(element):
+def extract_blocks(element):
     for tag in element.find_all(['script', 'style', 'nav', 'header', 'footer', 'aside', 'form', 'button']):
         tag.decompose()
     
-    text = element.get_text(separator=' ', strip=True)
+    blocks = []
+    current_block = None
+    parts = []
+    for string in element.find_all(string=True):
+        if type(string) is not NavigableString:
+            continue
+        text = string.strip()
+        if not text:
+            continue
+        
+        block = string.parent
+        while block is not element and block.name not in BLOCK_TAGS:
+            block = block.parent
+        
+        if block is not current_block and parts:
+            blocks.append(' '.join(parts))
+            parts = []
+        current_block = block
+        parts.append(text)
     
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    return ' '.join(lines)
+    if parts:
+        blocks.append(' '.join(parts))
+    return blocks
 
-def fetch_and_clean_content(url, config):
+def fast_clean_text(element):
+    return ' '.join(extract_blocks(element))
+
+def build_request_headers(config):
+    return {
+        "User-Agent": config["scraping"]["user_agent"],
+        "Accept": "text/html,application/xhtml+xml",
+        "Accept-Encoding": "gzip, deflate",
+        "Accept-Language": "en-US,en;q=0.5",
+        "Connection": "keep-alive"
+    }
+
+def extract_links(soup, base_url):
+    links = []
+    for anchor in soup.find_all('a', href=True):
+        link, _ = urldefrag(urljoin(base_url, anchor['href'].strip()))
+        if urlparse(link).scheme in ('http', 'https'):
+            links.append(link)
+    return links
+
+def fetch_and_clean_content(url, config, stats=None, page=None):
     start_time = time.time()
     
     try:
-        headers = {
-            "User-Agent": config["scraping"]["user_agent"],
-            "Accept": "text/html,application/xhtml+xml",
-            "Accept-Encoding": "gzip, deflate",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Connection": "keep-alive"
-        }
+        headers = build_request_headers(config)
         
         timeout = min(config["scraping"]["timeout"], 10)
         
-        response = requests.get(
-            url, 
-            headers=headers, 
-            timeout=timeout,
-            stream=True
-        )
+        # With stream=True the request returns once headers arrive, so "connect" covers DNS, TCP/TLS and TTFB
+        with stage("connect"):
+            response = get_http_session().get(
+                url, 
+                headers=headers, 
+                timeout=timeout,
+                stream=True
+            )
         response.raise_for_status()
         
         max_size = config["scraping"]["max_content_size"]
-        content = response.content[:max_size]
+        with stage("download"):
+            content = response.content[:max_size]
+        
+        with stage("parse"):
+            try:
+                soup = BeautifulSoup(content, 'lxml')
+            except:
+                soup = BeautifulSoup(content, 'html.parser')
+        
+        # Optional out-param for callers (the crawler) that need the page's links and pre-boilerplate text
+        if page is not None:
+            page["links"] = extract_links(soup, response.url)
         
-        try:
-            soup = BeautifulSoup(content, 'lxml')
-        except:
-            soup = BeautifulSoup(content, 'html.parser')
+        with stage("extract_main_content"):
+            main_content = extract_main_content(soup)
+        with stage("clean_text"):
+            blocks = extract_blocks(main_content)
+        full_text = ' '.join(blocks)
+        if page is not None:
+            page["full_text"] = full_text
+        with stage("boilerplate"):
+            text = ' '.join(strip_boilerplate(url, blocks, config))
         
-        main_content = extract_main_content(soup)
-        text = fast_clean_text(main_content)
+        bytes_saved = len(full_text.encode('utf-8')) - len(text.encode('utf-8'))
+        tokens_saved = estimate_tokens(full_text) - estimate_tokens(text)
+        if stats is not None:
+            stats["boilerplate_bytes_saved"] = bytes_saved
+            stats["boilerplate_tokens_saved"] = tokens_saved
+        if bytes_saved:
+            print(f"🧹 Removed site boilerplate - {bytes_saved} bytes, ~{tokens_saved} tokens saved")
         
+        # Pure safety cap; fitting long pages into the LLM budget is compress_for_summary's job
         max_chars = config["scraping"]["max_text_chars"]
         if len(text) > max_chars:
             text = text[:max_chars] + "..."
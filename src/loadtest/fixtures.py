@@ -0,0 +1,135 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "market research energy policy climate battery vehicle software release engineer "
+    "city council budget school health study patients results growth revenue quarter "
+    "launch platform customers security update network storage model training data "
+    "team season match player coach record museum artist exhibition history century"
+).split()
+
+def sample_latency(rng, median_ms, sigma):
+    # Log-normal around the median gives the long right tail real upstreams show
+    if median_ms <= 0:
+        return 0.0
+    return rng.lognormvariate(0, sigma) * median_ms / 1000.0
+
+def _paragraphs(rng, target_bytes):
+    paragraphs = []
+    size = 0
+    while size < target_bytes:
+        sentences = []
+        for _ in range(rng.randint(3, 6)):
+            sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20)))
+            sentences.append(sentence.capitalize() + ".")
+        paragraph = f"<p>{' '.join(sentences)}</p>"
+        paragraphs.append(paragraph)
+        size += len(paragraph)
+    return "".join(paragraphs)
+
+class _FixtureSiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        site = self.server.site
+        rng = random.Random(self.path)
+        roll = random.random()
+
+        delay = sample_latency(random, site["latency_ms_median"], site["latency_sigma"])
+        page_kb = site["page_kb"]
+        if roll < site["slow_fraction"]:
+            delay += site["slow_ms"] / 1000.0
+        elif roll < site["slow_fraction"] + site["large_fraction"]:
+            page_kb = site["large_kb"]
+        time.sleep(delay)
+
+        body = (
+            "<html><head><title>Fixture</title></head><body>"
+            "<nav><a href='/'>Home</a></nav>"
+            f"<main><h1>Fixture page {self.path}</h1>{_paragraphs(rng, page_kb * 1024)}</main>"
+            "<footer>Fixture site</footer></body></html>"
+        ).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class _FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        llm = self.server.llm
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        input_tokens = len(json.dumps(payload)) // 4
+
+        output_tokens = max(1, int(random.gauss(llm["output_tokens"], llm["output_tokens"] * 0.2)))
+        delay = sample_latency(random, llm["ttft_ms_median"], llm["ttft_sigma"])
+        delay += output_tokens / llm["tokens_per_second"]
+        time.sleep(delay)
+
+        summary = " ".join(random.choice(WORDS) for _ in range(max(output_tokens * 3 // 4, 80)))
+        text = json.dumps({"topic": "Fixture Page Summary", "summary": summary})
+
+        if self.path.endswith("/messages"):
+            response = {
+                "id": "msg_loadtest", "type": "message", "role": "assistant",
+                "model": payload.get("model", "fake"), "stop_reason": "end_turn",
+                "content": [{"type": "text", "text": text}],
+                "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens,
+                          "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0}
+            }
+        else:
+            response = {
+                "id": "chatcmpl-loadtest", "object": "chat.completion", "created": int(time.time()),
+                "model": payload.get("model", "fake"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": input_tokens, "completion_tokens": output_tokens,
+                          "total_tokens": input_tokens + output_tokens}
+            }
+
+        body = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class _BackgroundServer:
+    def __init__(self, handler, **attributes):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.daemon_threads = True
+        for name, value in attributes.items():
+            setattr(self.httpd, name, value)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def fixture_site(site_config):
+    # Serves deterministic article pages; a configurable share is slow or very large
+    return _BackgroundServer(_FixtureSiteHandler, site=site_config)
+
+def fake_llm_provider(llm_config):
+    # Speaks enough of the OpenAI chat-completions and Anthropic messages APIs for the real clients
+    return _BackgroundServer(_FakeLLMHandler, llm=llm_config)
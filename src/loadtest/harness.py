@@ -0,0 +1,265 @@
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+import numpy as np
+import requests
+from src.loadtest.fixtures import fixture_site, fake_llm_provider
+
+FAKE_API_KEY = "loadtest-fake-api-key"
+MEMORY_SAMPLE_SECONDS = 0.5
+REQUEST_TIMEOUT = 300
+
+OK, ERROR, SESSION_MISS = "ok", "error", "session_miss"
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_app(llm_base_url, app_workers):
+    port = _free_port()
+    env = dict(os.environ)
+    # Empty values shadow any real keys in .env (load_dotenv never overrides existing variables)
+    env.update({
+        "OPENAI_API_KEY": FAKE_API_KEY,
+        "OPENAI_BASE_URL": f"{llm_base_url}/v1",
+        "ANTHROPIC_API_KEY": FAKE_API_KEY,
+        "ANTHROPIC_BASE_URL": llm_base_url,
+        "AZURE_OPENAI_API_KEY": "",
+        "AZURE_OPENAI_ENDPOINT": "",
+        "GOOGLE_API_KEY": "",
+    })
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.server:app",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(app_workers), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL
+    )
+    return process, f"http://127.0.0.1:{port}"
+
+def wait_until_ready(process, base_url, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API server exited during startup with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/ready", timeout=2).status_code == 200:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError("API server did not become ready in time")
+
+def _process_tree_rss_mb(pid):
+    # Linux only: the uvicorn parent plus its worker processes
+    try:
+        children = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                with open(f"/proc/{entry}/stat") as stat:
+                    fields = stat.read().rsplit(")", 1)[1].split()
+                children.setdefault(int(fields[1]), []).append(int(entry))
+    except OSError:
+        return None
+
+    total_kb = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return round(total_kb / 1024, 1)
+
+class _MemorySampler(threading.Thread):
+    def __init__(self, pid, start_time):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.start_time = start_time
+        self.samples = []
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            rss_mb = _process_tree_rss_mb(self.pid)
+            if rss_mb is not None:
+                self.samples.append({"t": round(time.time() - self.start_time, 2), "rss_mb": rss_mb})
+            self.stop_event.wait(MEMORY_SAMPLE_SECONDS)
+
+def _virtual_user(base_url, site_url, provider, model, chat_turns, page_ids, deadline, records):
+    session = requests.Session()
+    while time.time() < deadline:
+        page_url = f"{site_url}/articles/{next(page_ids)}"
+        started = time.time()
+        session_id = None
+        try:
+            response = session.post(
+                f"{base_url}/summarize",
+                json={"url": page_url, "provider": provider, "model": model},
+                timeout=REQUEST_TIMEOUT
+            )
+            outcome = OK if response.status_code == 200 else ERROR
+            if outcome == OK:
+                session_id = response.json().get("session_id")
+        except requests.exceptions.RequestException:
+            outcome = ERROR
+        records.append(("summarize", started, time.time() - started, outcome))
+
+        for turn in range(chat_turns if session_id else 0):
+            if time.time() >= deadline:
+                break
+            started = time.time()
+            try:
+                response = session.post(
+                    f"{base_url}/chat",
+                    json={"session_id": session_id, "question": f"What is point {turn + 1} of the page?"},
+                    timeout=REQUEST_TIMEOUT
+                )
+                if response.status_code == 200:
+                    outcome = OK
+                elif response.status_code == 404:
+                    # Sessions live in one worker's memory; with several workers the chat can land elsewhere
+                    outcome = SESSION_MISS
+                else:
+                    outcome = ERROR
+            except requests.exceptions.RequestException:
+                outcome = ERROR
+            records.append(("chat", started, time.time() - started, outcome))
+
+def _summarize_records(records, elapsed):
+    summary = {}
+    for endpoint in ("summarize", "chat", "all"):
+        selected = [r for r in records if endpoint == "all" or r[0] == endpoint]
+        latencies = np.array([r[2] for r in selected if r[3] == OK])
+        errors = sum(1 for r in selected if r[3] == ERROR)
+        summary[endpoint] = {
+            "requests": len(selected),
+            "errors": errors,
+            # Harness artefact with --app-workers > 1, kept out of the error rate and saturation
+            "session_misses": sum(1 for r in selected if r[3] == SESSION_MISS),
+            "error_rate": round(errors / (len(latencies) + errors), 4) if errors else 0.0,
+            # Fast failures inflate raw throughput; successful_rps is the useful work done
+            "throughput_rps": round(len(selected) / elapsed, 3) if elapsed else 0.0,
+            "successful_rps": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+            "latency_seconds": {
+                f"p{q}": round(float(np.percentile(latencies, q)), 4) for q in (50, 90, 95, 99)
+            } if len(latencies) else {}
+        }
+    return summary
+
+def run_stage(base_url, site_url, provider, model, concurrency, stage_seconds, chat_turns, page_ids):
+    records = []
+    start_time = time.time()
+    deadline = start_time + stage_seconds
+    users = [
+        threading.Thread(
+            target=_virtual_user,
+            args=(base_url, site_url, provider, model, chat_turns, page_ids, deadline, records),
+            daemon=True
+        )
+        for _ in range(concurrency)
+    ]
+    for user in users:
+        user.start()
+    for user in users:
+        user.join()
+
+    elapsed = time.time() - start_time
+    result = {"concurrency": concurrency, "elapsed_seconds": round(elapsed, 2)}
+    result.update(_summarize_records(records, elapsed))
+    return result
+
+def find_saturation(stages, max_p99_seconds, min_gain=0.1, max_error_rate=0.01):
+    # Last concurrency level before successful throughput stops growing, errors appear or
+    # p99 breaks the budget. Returns (status, concurrency):
+    #   "reached"                 - concurrency is the last healthy stage
+    #   "degraded_at_first_stage" - even the lowest stage was over budget; concurrency is None
+    #   "not_reached"             - every stage scaled; concurrency is the highest one tested
+    previous = None
+    for stage in stages:
+        overall = stage["all"]
+        p99 = overall["latency_seconds"].get("p99", float("inf"))
+        degraded = overall["error_rate"] > max_error_rate or p99 > max_p99_seconds
+        flat = previous is not None and overall["successful_rps"] < previous["all"]["successful_rps"] * (1 + min_gain)
+        if degraded or flat:
+            if previous is None:
+                return "degraded_at_first_stage", None
+            return "reached", previous["concurrency"]
+        previous = stage
+    return "not_reached", previous["concurrency"] if previous else None
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_load_test(config, provider, model, stages, stage_seconds, chat_turns, app_workers):
+    settings = config["loadtest"]
+    page_ids = itertools.count()
+
+    with fixture_site(settings["site"]) as site, fake_llm_provider(settings["llm"]) as llm:
+        process, base_url = start_app(llm.base_url, app_workers)
+        try:
+            wait_until_ready(process, base_url)
+            print(f"🎯 API ready at {base_url} - site {site.base_url}, fake {provider} at {llm.base_url}")
+
+            start_time = time.time()
+            sampler = _MemorySampler(process.pid, start_time)
+            sampler.start()
+
+            stage_results = []
+            for concurrency in stages:
+                stage = run_stage(base_url, site.base_url, provider, model, concurrency,
+                                  stage_seconds, chat_turns, page_ids)
+                stage["started_at_seconds"] = round(time.time() - start_time - stage["elapsed_seconds"], 2)
+                stage_results.append(stage)
+                overall = stage["all"]
+                print(f"📈 {concurrency:>4} users: {overall['throughput_rps']:.2f} req/s "
+                      f"({overall['successful_rps']:.2f} successful), "
+                      f"p99 {overall['latency_seconds'].get('p99', float('nan')):.2f}s, "
+                      f"errors {overall['error_rate']:.1%}"
+                      + (f", {overall['session_misses']} chat session misses" if overall["session_misses"] else ""))
+
+            sampler.stop_event.set()
+            sampler.join()
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    saturation_status, saturation_concurrency = find_saturation(stage_results, settings["max_p99_seconds"])
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "provider": provider,
+            "model": model,
+            "app_workers": app_workers,
+            "stage_seconds": stage_seconds,
+            "chat_turns": chat_turns,
+            "site": settings["site"],
+            "llm": settings["llm"],
+        },
+        "stages": stage_results,
+        "memory": sampler.samples,
+        "saturation_status": saturation_status,
+        "saturation_concurrency": saturation_concurrency,
+    }
+
+def write_results(results, output_path):
+    with open(output_path, "w") as file:
+        json.dump(results, file, indent=2)
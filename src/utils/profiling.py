@@ -0,0 +1,174 @@
+import contextvars
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import parse_qs
+
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+# Crawl worker threads record stages for the same request concurrently
+_timings_lock = threading.Lock()
+
+# Hard cap on tracked requests so a traffic burst cannot grow the window without bound
+MAX_TRACKED_REQUESTS = 10000
+
+_recent_requests = deque(maxlen=MAX_TRACKED_REQUESTS)
+_recent_lock = threading.Lock()
+
+@contextmanager
+def stage(name):
+    # Costs one ContextVar lookup when the request is not being timed
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+
+    timings["threads"].add(threading.get_ident())
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _timings_lock:
+            stages = timings["stages"]
+            stages[name] = stages.get(name, 0.0) + elapsed
+
+class StackSampler(threading.Thread):
+    # Periodically snapshots the stacks of the threads working on one request and
+    # aggregates them in collapsed ("folded") format for flamegraph.pl / speedscope
+    def __init__(self, thread_ids, interval):
+        super().__init__(daemon=True, name="request-profiler")
+        self.thread_ids = thread_ids
+        self.interval = interval
+        self.counts = {}
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.thread_ids):
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+        return "\n".join(f"{stack} {count}" for stack, count in sorted(self.counts.items())) + "\n"
+
+def _expire(now, window_seconds):
+    while _recent_requests and _recent_requests[0]["timestamp"] < now - window_seconds:
+        _recent_requests.popleft()
+
+def record_request(entry, window_seconds):
+    # Rolling window of recent requests; ranked only when read, so old outliers age out
+    with _recent_lock:
+        _recent_requests.append(entry)
+        _expire(entry["timestamp"], window_seconds)
+
+def get_slowest_requests(limit, window_seconds):
+    with _recent_lock:
+        _expire(time.time(), window_seconds)
+        recent = list(_recent_requests)
+    return sorted(recent, key=lambda entry: entry["duration_ms"], reverse=True)[:limit]
+
+def reset_recent_requests():
+    with _recent_lock:
+        _recent_requests.clear()
+
+def profile_path(settings, profile_id):
+    return os.path.join(settings["output_dir"], f"{profile_id}.folded")
+
+def prune_profiles(settings):
+    # Keeps the newest max_profiles files; workers share output_dir, so files may vanish under us
+    output_dir = settings["output_dir"]
+    profiles = []
+    for name in os.listdir(output_dir):
+        if name.endswith(".folded"):
+            path = os.path.join(output_dir, name)
+            try:
+                profiles.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+    profiles.sort(reverse=True)
+    for _, path in profiles[settings["max_profiles"]:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+class ProfilingMiddleware:
+    # Pure ASGI middleware: always records per-stage timings for the rolling slowest-requests
+    # window, and runs the stack sampler only for requests that opt in
+    def __init__(self, app, settings):
+        self.app = app
+        self.settings = settings
+        self.header = settings["header"].lower().encode("latin-1")
+
+    def _wants_profile(self, scope):
+        if not self.settings["enabled"]:
+            return False
+        for name, value in scope.get("headers", ()):
+            if name == self.header and value.lower() in (b"1", b"true", b"yes"):
+                return True
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        return query.get(self.settings["query_param"], [""])[0].lower() in ("1", "true", "yes")
+
+    async def __call__(self, scope, receive, send):
+        limit = self.settings["slowest_requests"]
+        if scope["type"] != "http" or (limit <= 0 and not self.settings["enabled"]):
+            await self.app(scope, receive, send)
+            return
+
+        timings = {"stages": {}, "threads": {threading.get_ident()}}
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+
+        sampler = None
+        profile_id = None
+        if self._wants_profile(scope):
+            profile_id = uuid.uuid4().hex
+            sampler = StackSampler(timings["threads"], self.settings["sample_interval_ms"] / 1000.0)
+            sampler.start()
+
+        async def send_wrapper(message):
+            nonlocal sampler
+            if message["type"] == "http.response.start" and sampler is not None:
+                folded = sampler.stop()
+                sampler = None
+                os.makedirs(self.settings["output_dir"], exist_ok=True)
+                with open(profile_path(self.settings, profile_id), "w") as file:
+                    file.write(folded)
+                prune_profiles(self.settings)
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-profile-id", profile_id.encode("latin-1")),
+                    (b"x-profile-url", f"/profiling/profiles/{profile_id}".encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if sampler is not None:
+                sampler.stop()
+            _request_timings.reset(token)
+            if limit > 0:
+                record_request({
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                    "stages_ms": {name: round(seconds * 1000, 2) for name, seconds in timings["stages"].items()},
+                    "profile_id": profile_id,
+                    "timestamp": time.time(),
+                }, self.settings["slowest_window_seconds"])
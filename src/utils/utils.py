@@ -1,6 +1,11 @@
 import os
 import sys
 
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
 def ensure_project_root():
     if not os.path.exists("conf/config.yaml"):
         print("❌ Error: conf/config.yaml not found")
@@ -0,0 +1,46 @@
+import random
+import pytest
+from src.core.boilerplate import simhash, strip_boilerplate, reset_boilerplate_store
+
+CONFIG = {
+    "boilerplate": {
+        "enabled": True,
+        "min_pages": 2,
+        "max_hamming_distance": 3,
+        "min_block_chars": 10,
+        "max_removed_ratio": 0.6,
+        "max_hosts": 16,
+        "max_fingerprints_per_host": 100,
+    }
+}
+
+ARTICLE_WORDS = "river mountain harbour festival library orchestra vineyard glacier canyon meadow".split()
+
+@pytest.fixture(autouse=True)
+def clean_store():
+    reset_boilerplate_store()
+    yield
+    reset_boilerplate_store()
+
+def page(banner, seed):
+    rng = random.Random(seed)
+    return [banner] + [" ".join(rng.choice(ARTICLE_WORDS) for _ in range(40)) for _ in range(5)]
+
+def test_simhash_handles_non_ascii_text():
+    assert simhash("Мы используем файлы cookie на этом сайте") is not None
+    assert simhash("本サイトではクッキーを使用しています") is not None
+
+def test_recurring_block_is_removed_from_later_pages():
+    banner = "Accept our cookies to continue browsing this site"
+    first = page(banner, 1)
+    second = page(banner, 2)
+
+    assert strip_boilerplate("https://news.example/a", first, CONFIG) == first
+    assert strip_boilerplate("https://news.example/b", second, CONFIG) == second[1:]
+
+def test_query_string_identifies_distinct_pages():
+    banner = "Подпишитесь на нашу рассылку, чтобы получать новости"
+    strip_boilerplate("https://news.example/article.php?id=1", page(banner, 1), CONFIG)
+    second = page(banner, 2)
+
+    assert strip_boilerplate("https://news.example/article.php?id=2", second, CONFIG) == second[1:]
@@ -0,0 +1,36 @@
+import random
+from src.core.compressor import compress_for_summary, compress_text, split_sentences
+from src.utils.utils import estimate_tokens
+
+CONFIG = {"text_processing": {"compression": {"enabled": True, "target_tokens": 200}}}
+
+def long_text():
+    topical = [f"Solar panel output in region {i} rose as solar farms expanded." for i in range(40)]
+    rng = random.Random(0)
+    filler = [" ".join(f"w{rng.randrange(5000)}" for _ in range(8)).capitalize() + "." for _ in range(200)]
+    # Relevant sentences are spread through the whole page, including its tail
+    return " ".join(filler[:100] + topical[:20] + filler[100:] + topical[20:])
+
+def test_compress_text_keeps_budget_and_original_order():
+    text = long_text()
+    compressed = compress_text(text, 200)
+    kept = split_sentences(compressed)
+    positions = [text.index(sentence) for sentence in kept]
+
+    assert len(compressed) <= 200 * 4
+    assert positions == sorted(positions)
+    # Sentences past the truncation point survive, unlike a plain cut at the budget
+    assert max(positions) > len(text) // 2
+
+def test_compress_for_summary_reports_savings_once():
+    text = long_text()
+    stats = {}
+    compressed = compress_for_summary(text, CONFIG, stats)
+
+    assert estimate_tokens(compressed) <= 200
+    assert stats["compression_tokens_saved"] == estimate_tokens(text) - estimate_tokens(compressed)
+
+def test_short_text_is_untouched():
+    stats = {}
+    assert compress_for_summary("Short page.", CONFIG, stats) == "Short page."
+    assert stats == {}
@@ -0,0 +1,160 @@
+import copy
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.config.settings import load_config
+from src.core.boilerplate import reset_boilerplate_store
+from src.core.crawler import crawl_site, summarize_crawl
+from src.utils.profiling import _request_timings
+
+PAGE_LATENCY = 0.1
+PAGE_COUNT = 20
+DUPLICATES = {7: 3, 8: 3}
+WORDS = "alpha beta gamma delta epsilon zeta theta iota kappa lambda omicron sigma tau upsilon".split()
+
+def page_html(index):
+    rng = random.Random(DUPLICATES.get(index, index))
+    text = " ".join(rng.choice(WORDS) for _ in range(300)) + "."
+    nav = "".join(f'<li><a href="/docs/p{i}">Page {i}</a></li>' for i in range(PAGE_COUNT))
+    return (
+        f"<html><body><main><ul>{nav}</ul>"
+        f"<p>{text}</p>"
+        "<div>Related articles: subscribe to our newsletter for weekly updates</div>"
+        '<a href="/blog/elsewhere">Blog</a><a href="https://other.example/">External</a>'
+        "</main></body></html>"
+    )
+
+class _FixtureSiteHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(PAGE_LATENCY)
+        self.server.requested.append(self.path)
+        if self.path == "/sitemap.xml":
+            host = self.headers["Host"]
+            # /docs/gone is listed but returns 404
+            locs = [f"http://{host}/docs/p{i}" for i in (10, 11)] + [f"http://{host}/docs/gone"]
+            body = "<urlset>" + "".join(f"<url><loc>{loc}</loc></url>" for loc in locs) + "</urlset>"
+            content_type = "application/xml"
+        elif self.path.startswith("/docs/p") and self.path[7:].isdigit() and int(self.path[7:]) < PAGE_COUNT:
+            body = page_html(int(self.path[7:]))
+            content_type = "text/html"
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        encoded = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureSiteHandler)
+    server.daemon_threads = True
+    server.requested = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    reset_boilerplate_store()
+    yield server
+    reset_boilerplate_store()
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def config():
+    config = copy.deepcopy(load_config())
+    config["crawl"].update(max_pages=PAGE_COUNT + 1, per_host_concurrency=8, per_host_delay=0.0)
+    return config
+
+def seed_url(site):
+    return f"http://127.0.0.1:{site.server_address[1]}/docs/p0"
+
+def test_crawl_skips_exact_duplicates_with_boilerplate_learning_on(site, config):
+    assert config["boilerplate"]["enabled"]
+
+    pages, stats = crawl_site(seed_url(site), config)
+
+    assert stats["pages_fetched"] == PAGE_COUNT
+    assert stats["errors"] == 1
+    assert stats["duplicates_skipped"] == len(DUPLICATES)
+    assert len(pages) == PAGE_COUNT - len(DUPLICATES)
+
+def test_crawl_stays_in_section(site, config):
+    pages, _ = crawl_site(seed_url(site), config)
+
+    assert all("/docs/" in page["url"] for page in pages)
+    assert not any(path.startswith("/blog") for path in site.requested)
+
+def test_crawl_fetches_concurrently_without_politeness_delay(site, config):
+    start = time.time()
+    _, stats = crawl_site(seed_url(site), config)
+    elapsed = time.time() - start
+
+    # A serial crawl needs at least PAGE_COUNT * PAGE_LATENCY seconds
+    assert stats["pages_fetched"] == PAGE_COUNT
+    assert elapsed < PAGE_COUNT * PAGE_LATENCY / 2
+
+def test_per_host_delay_bounds_request_rate(site, config):
+    config["crawl"].update(per_host_delay=0.25, use_sitemap=False)
+
+    start = time.time()
+    _, stats = crawl_site(seed_url(site), config, max_pages=5)
+    elapsed = time.time() - start
+
+    assert stats["pages_fetched"] == 5
+    assert elapsed >= 4 * 0.25
+
+def test_request_cannot_exceed_configured_page_budget(site, config):
+    config["crawl"]["max_pages"] = 3
+
+    _, stats = crawl_site(seed_url(site), config, max_pages=1000)
+
+    assert stats["pages_requested"] == 3
+
+def test_crawl_stages_are_timed_in_worker_threads(site, config):
+    timings = {"stages": {}, "threads": {threading.get_ident()}}
+    token = _request_timings.set(timings)
+    try:
+        crawl_site(seed_url(site), config)
+    finally:
+        _request_timings.reset(token)
+
+    # Fetch threads run in copies of the request context, so their stages are recorded
+    # and the stack sampler can find them
+    assert timings["stages"]["connect"] >= PAGE_COUNT * PAGE_LATENCY
+    assert len(timings["threads"]) > 1
+
+class _ScriptedLLM:
+    # Replies with invalid output for any prompt containing one of the given markers
+    def __init__(self, failing_markers):
+        self.failing_markers = failing_markers
+
+    def invoke(self, messages):
+        from langchain_core.messages import AIMessage
+        prompt = messages[-1].content
+        if any(marker in prompt for marker in self.failing_markers):
+            return AIMessage(content="not json at all")
+        return AIMessage(content=json.dumps({"topic": "Fixture Docs Topic", "summary": f"About {len(prompt)} chars."}))
+
+CRAWLED = [{"url": f"http://example.com/docs/p{i}", "text": f"Page number {i} explains feature {i}."} for i in range(3)]
+
+def test_failed_page_summaries_are_left_out_of_the_rollup(config):
+    page_summaries, summary, topic, failed = summarize_crawl(CRAWLED, _ScriptedLLM(["feature 1."]), config)
+
+    assert failed == 1
+    assert [page["url"] for page in page_summaries] == [CRAWLED[0]["url"], CRAWLED[2]["url"]]
+    assert summary.startswith("About") and topic == "Fixture Docs Topic"
+
+def test_failed_rollup_returns_no_summary(config):
+    page_summaries, summary, topic, failed = summarize_crawl(CRAWLED, _ScriptedLLM(["Page: "]), config)
+
+    assert failed == 0 and len(page_summaries) == 3
+    assert summary is None and topic is None
@@ -0,0 +1,125 @@
+import copy
+import json
+import time
+import pytest
+from src.config.settings import load_config
+from src.core import incremental
+from src.core.incremental import diff_blocks, get_previous_result, remember_result
+
+CHANGELOG = " ".join(["Fixed bug.", "Updated docs."] * 3000)
+URL = "https://example.com/store"
+
+@pytest.fixture
+def config():
+    config = copy.deepcopy(load_config())
+    config["incremental"].update(enabled=True, max_change_ratio=0.3, max_urls=3,
+                                 max_total_chars=1000, max_page_chars=400)
+    incremental.reset_previous_results()
+    yield config
+    incremental.reset_previous_results()
+
+def stub_server(monkeypatch, config, pages, replies):
+    # The /summarize endpoint with the scraper, provider and LLM replaced; returns a client and the prompts sent
+    pytest.importorskip("langchain_core")
+    from fastapi.testclient import TestClient
+    from langchain_core.messages import AIMessage
+    from src.api import server
+
+    pages = iter(pages)
+    replies = iter(replies)
+    prompts = []
+
+    class FakeLLM:
+        def invoke(self, messages):
+            prompts.append(messages[-1].content)
+            return AIMessage(content=next(replies))
+
+    class FakeConversation:
+        def set_context(self, context):
+            pass
+
+    monkeypatch.setattr(server, "get_config", lambda: config)
+    monkeypatch.setattr(server, "select_provider", lambda config, provider, model: ("stub", "stub-model"))
+    monkeypatch.setattr(server, "fetch_and_clean_content", lambda url, config, stats=None: (next(pages), None))
+    monkeypatch.setattr(server, "get_llm", lambda provider, model: FakeLLM())
+    monkeypatch.setattr(server, "create_conversation_chain", lambda *args, **kwargs: FakeConversation())
+    return TestClient(server.app), prompts
+
+def reply(summary):
+    return json.dumps({"topic": "Store Opening Hours", "summary": summary})
+
+def test_diff_reports_changed_and_removed_blocks():
+    old = "The store opens at nine. Prices are listed below. Parking is free."
+    new = "The store opens at ten. Prices are listed below. Parking is free."
+    ratio, changed, removed = diff_blocks(old, new)
+
+    assert changed == ["The store opens at ten."]
+    assert removed == ["The store opens at nine."]
+    assert 0 < ratio < 0.5
+
+def test_diff_is_fast_on_repetitive_pages():
+    # Thousands of identical sentences used to make the block diff near-quadratic
+    for new in ("Release 2.0 shipped. " + CHANGELOG, CHANGELOG + " Release 2.0 shipped.",
+                "Release 2.0 shipped. " + CHANGELOG + " Another line."):
+        start = time.perf_counter()
+        ratio, changed, removed = diff_blocks(CHANGELOG, new)
+        assert time.perf_counter() - start < 0.5
+        assert changed
+
+    ratio, changed, removed = diff_blocks(CHANGELOG, "Release 2.0 shipped. " + CHANGELOG)
+    assert changed == ["Release 2.0 shipped."] and removed == []
+
+def test_store_is_bounded_by_total_text(config):
+    for i in range(3):
+        remember_result(f"https://example.com/{i}", "x" * 350, "summary", "topic", config)
+
+    # 3 x 350 chars is over the 1000-char budget, so the least recently used page goes
+    assert get_previous_result("https://example.com/0") is None
+    assert get_previous_result("https://example.com/2") is not None
+
+def test_oversized_pages_are_not_kept(config):
+    remember_result(URL, "short page", "summary", "topic", config)
+    remember_result(URL, "x" * 401, "summary", "topic", config)
+
+    assert get_previous_result(URL) is None
+
+def test_failed_update_falls_back_to_full_summary(monkeypatch, config):
+    config["incremental"]["max_page_chars"] = config["incremental"]["max_total_chars"] = 10000
+    rest = " ".join(f"Aisle {i} stocks item group {i}." for i in range(20))
+    client, prompts = stub_server(
+        monkeypatch, config,
+        [f"The store opens at nine. {rest}", f"The store opens at ten. {rest}"],
+        [reply("Opens at nine."), "not json at all", reply("Opens at ten.")]
+    )
+
+    client.post("/summarize", json={"url": URL})
+    response = client.post("/summarize", json={"url": URL})
+
+    assert response.status_code == 200
+    assert response.json()["summary"] == "Opens at ten."
+    assert response.json()["incremental_tokens_saved"] == 0
+    # Update attempt, then a full summary of the new page rather than the update prompt
+    assert "Opens at nine." in prompts[1]
+    assert prompts[2] == f"Content: The store opens at ten. {rest}"
+    assert get_previous_result(URL)["summary"] == "Opens at ten."
+
+def test_update_larger_than_compressed_page_uses_full_summary(monkeypatch, config):
+    # A small change ratio on a long page can still be more text than the compressed full page
+    config["incremental"]["max_page_chars"] = config["incremental"]["max_total_chars"] = 10 ** 6
+    config["text_processing"]["compression"].update(enabled=True, target_tokens=500)
+    old = [f"Section {i} describes product line {i} in detail." for i in range(2000)]
+    new = old[:1800] + [f"Section {i} was rewritten with new pricing {i}." for i in range(1800, 2000)]
+    client, prompts = stub_server(
+        monkeypatch, config, [" ".join(old), " ".join(new)], [reply("Old catalogue."), reply("New catalogue.")]
+    )
+
+    client.post("/summarize", json={"url": URL})
+    response = client.post("/summarize", json={"url": URL})
+
+    assert response.status_code == 200
+    assert response.json()["diff_ratio"] < 0.3
+    assert response.json()["incremental_tokens_saved"] == 0
+    # One full (compressed) summary, no update call carrying the previous summary
+    assert len(prompts) == 2
+    assert "Old catalogue." not in prompts[1]
+    assert len(prompts[1]) <= 500 * 4 + len("Content: ")
@@ -0,0 +1,33 @@
+from src.loadtest.harness import ERROR, OK, SESSION_MISS, _summarize_records, find_saturation
+
+def make_stage(concurrency, successful_rps, error_rate=0.0, p99=1.0):
+    return {"concurrency": concurrency,
+            "all": {"successful_rps": successful_rps, "error_rate": error_rate, "latency_seconds": {"p99": p99}}}
+
+def test_successful_rps_excludes_failures():
+    records = [("summarize", 0.0, 0.5, OK)] * 10 + [("summarize", 0.0, 0.01, ERROR)] * 30
+    overall = _summarize_records(records, 10.0)["all"]
+
+    assert overall["throughput_rps"] == 4.0
+    assert overall["successful_rps"] == 1.0
+
+def test_chat_session_misses_are_not_errors():
+    records = [("summarize", 0.0, 0.5, OK)] * 10 + [("chat", 0.0, 0.01, SESSION_MISS)] * 20
+    summary = _summarize_records(records, 10.0)
+
+    assert summary["chat"]["session_misses"] == 20
+    assert summary["all"]["error_rate"] == 0.0
+    assert find_saturation([{"concurrency": 1, **summary}], max_p99_seconds=5) == ("not_reached", 1)
+
+def test_saturation_outcomes_are_distinguishable():
+    scaling = [make_stage(1, 1.0), make_stage(2, 2.0), make_stage(4, 3.9)]
+    assert find_saturation(scaling, max_p99_seconds=5) == ("not_reached", 4)
+
+    flattening = scaling + [make_stage(8, 4.0)]
+    assert find_saturation(flattening, max_p99_seconds=5) == ("reached", 4)
+
+    erroring = [make_stage(1, 1.0, error_rate=0.5), make_stage(2, 2.0)]
+    assert find_saturation(erroring, max_p99_seconds=5) == ("degraded_at_first_stage", None)
+
+    slow = [make_stage(1, 1.0, p99=9.0)]
+    assert find_saturation(slow, max_p99_seconds=5) == ("degraded_at_first_stage", None)
@@ -0,0 +1,56 @@
+import os
+import time
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from fastapi.testclient import TestClient
+from src.api import server
+from src.config.settings import get_config
+from src.utils import profiling
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    # The middleware and the profiling routes share the cached config's profiling section
+    settings = get_config()["profiling"]
+    for key, value in {"enabled": True, "output_dir": str(tmp_path), "max_profiles": 2,
+                       "slowest_requests": 5, "slowest_window_seconds": 60, "sample_interval_ms": 1}.items():
+        monkeypatch.setitem(settings, key, value)
+    profiling.reset_recent_requests()
+    yield TestClient(server.app)
+    profiling.reset_recent_requests()
+
+def test_header_and_query_opt_in_return_a_profile(client, tmp_path):
+    plain = client.get("/health")
+    by_header = client.get("/health", headers={"X-Profile": "1"})
+    by_query = client.get("/health?profile=true")
+
+    assert "x-profile-id" not in plain.headers
+    for response in (by_header, by_query):
+        profile_id = response.headers["x-profile-id"]
+        assert response.headers["x-profile-url"] == f"/profiling/profiles/{profile_id}"
+        assert client.get(response.headers["x-profile-url"]).status_code == 200
+    assert len(os.listdir(tmp_path)) == 2
+
+def test_only_newest_profiles_are_kept(client, tmp_path):
+    ids = []
+    for _ in range(4):
+        ids.append(client.get("/health", headers={"X-Profile": "1"}).headers["x-profile-id"])
+        time.sleep(0.02)
+
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{profile_id}.folded" for profile_id in ids[-2:])
+    assert client.get(f"/profiling/profiles/{ids[0]}").status_code == 404
+
+def test_slowest_requests_cover_a_rolling_window(client):
+    now = time.time()
+    # A very slow request from before the window must not hide newer ones
+    profiling.record_request({"path": "/old", "duration_ms": 90000.0, "timestamp": now - 120}, 60)
+    profiling.record_request({"path": "/recent", "duration_ms": 500.0, "timestamp": now}, 60)
+    client.get("/health")
+
+    slowest = client.get("/profiling/slowest").json()["requests"]
+    paths = [entry["path"] for entry in slowest]
+
+    assert paths[0] == "/recent"
+    assert "/health" in paths
+    assert "/old" not in paths
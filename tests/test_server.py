@@ -0,0 +1,61 @@
+import signal
+import time
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from fastapi.testclient import TestClient
+from src.api import server
+
+def test_worker_is_ready_after_warmup(monkeypatch):
+    warmed = []
+    monkeypatch.setattr(server, "warm_up_worker", lambda: warmed.append(True))
+
+    with TestClient(server.app) as client:
+        assert warmed
+        assert client.get("/ready").status_code == 200
+        assert client.get("/health").status_code == 200
+    assert server.worker_state["ready"] is False
+
+def test_sigterm_drains_readiness_before_shutdown(monkeypatch):
+    stopped = []
+    original = signal.signal(signal.SIGTERM, lambda sig, frame: stopped.append(sig))
+    monkeypatch.setitem(server.worker_state, "ready", True)
+    try:
+        server.drain_on_sigterm(0.2)
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+
+        # Still serving, but no longer ready, and uvicorn has not been told to exit yet
+        client = TestClient(server.app)
+        assert client.get("/ready").status_code == 503
+        assert client.get("/health").status_code == 200
+        assert stopped == []
+
+        time.sleep(0.4)
+        assert stopped == [signal.SIGTERM]
+    finally:
+        signal.signal(signal.SIGTERM, original)
+
+def test_crawl_reports_fetch_errors_and_fails_without_a_summary(monkeypatch):
+    stats = {"pages_requested": 3, "pages_fetched": 2, "duplicates_skipped": 0, "errors": 1}
+    pages = [{"url": "https://example.com/docs/a", "text": "A."}, {"url": "https://example.com/docs/b", "text": "B."}]
+    page_summaries = [{"url": page["url"], "summary": "Fine.", "main_topic": "Docs"} for page in pages]
+    rollups = iter([("All fine.", "Docs"), (None, None)])
+
+    class FakeConversation:
+        def set_context(self, context):
+            pass
+
+    monkeypatch.setattr(server, "select_provider", lambda config, provider, model: ("stub", "stub-model"))
+    monkeypatch.setattr(server, "crawl_site", lambda url, config, max_pages=None: (pages, stats))
+    monkeypatch.setattr(server, "get_llm", lambda provider, model: None)
+    monkeypatch.setattr(server, "summarize_crawl", lambda pages, llm, config: (page_summaries, *next(rollups), 0))
+    monkeypatch.setattr(server, "create_conversation_chain", lambda *args, **kwargs: FakeConversation())
+    client = TestClient(server.app)
+
+    response = client.post("/crawl", json={"url": "https://example.com/docs/a"})
+    assert response.status_code == 200
+    assert response.json()["pages_crawled"] == 2
+    assert response.json()["fetch_errors"] == 1
+
+    assert client.post("/crawl", json={"url": "https://example.com/docs/a"}).status_code == 502